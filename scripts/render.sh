@@ -0,0 +1,16 @@
+#!/usr/bin/env bash
+# Renders a session folder to a clean, loudness-normalized podcast WAV.
+# Usage: ./scripts/render.sh <session> [--mp4 PATH] [--offset SECONDS] [--output PATH]
+
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+PROJECT_DIR="$(dirname "$SCRIPT_DIR")"
+
+if [ $# -lt 1 ]; then
+    echo "Usage: $0 <session> [--mp4 PATH] [--offset SECONDS] [--output PATH]"
+    exit 1
+fi
+
+cd "$PROJECT_DIR"
+exec python3 -m src.render "$@"
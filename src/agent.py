@@ -9,9 +9,12 @@ Usage:
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 
 import httpx
+import openai as openai_sdk
 from livekit import agents, api, rtc
 from livekit.agents import (
     Agent,
@@ -24,6 +27,7 @@ from livekit.plugins import openai, silero
 
 from src.avatar.static import publish_avatar
 from src.config import load_config
+from src.pipelined_tts import PipelinedTTS, tag_reply_request
 from src.session_recorder import SessionRecorder
 
 logger = logging.getLogger("clawcast")
@@ -49,13 +53,32 @@ async def entrypoint(ctx: agents.JobContext):
     recorder = SessionRecorder(room_id=room_name, output_dir=cfg.egress.output_dir)
 
     # Publish avatar video track
-    await publish_avatar(ctx.room, cfg.agent.avatar, cfg.agent.avatar_bg_color)
+    _, avatar_task = await publish_avatar(ctx.room, cfg.agent.avatar, cfg.agent.avatar_bg_color)
     logger.info("Avatar published")
 
     # Start egress recording (non-fatal if it fails)
     await _start_egress(room_name)
 
-    # Build the voice pipeline
+    # Build the voice pipeline. The TTS client tags each sentence request
+    # with its reply id so archival audio can be popped per reply.
+    tts_client = openai_sdk.AsyncClient(
+        api_key="local",
+        base_url=cfg.tts.base_url,
+        max_retries=0,
+        http_client=httpx.AsyncClient(
+            timeout=httpx.Timeout(connect=15.0, read=5.0, write=5.0, pool=5.0),
+            event_hooks={"request": [tag_reply_request]},
+        ),
+    )
+    pipelined_tts = PipelinedTTS(
+        tts=openai.TTS(
+            model="tts-1",
+            voice=cfg.tts.voice,
+            speed=cfg.tts.speed,
+            client=tts_client,
+        ),
+        lookahead=cfg.tts.lookahead,
+    )
     session = AgentSession(
         vad=silero.VAD.load(
             min_speech_duration=cfg.vad.min_speech_duration,
@@ -73,13 +96,7 @@ async def entrypoint(ctx: agents.JobContext):
             temperature=cfg.llm.temperature,
             max_completion_tokens=cfg.llm.max_tokens,
         ),
-        tts=openai.TTS(
-            model="tts-1",
-            voice=cfg.tts.voice,
-            speed=cfg.tts.speed,
-            base_url=cfg.tts.base_url,
-            api_key="local",
-        ),
+        tts=pipelined_tts,
         min_interruption_duration=cfg.vad.interrupt_min_duration,
         min_endpointing_delay=cfg.vad.silence_threshold,
     )
@@ -91,14 +108,34 @@ async def entrypoint(ctx: agents.JobContext):
             logger.info("[Host] %s", event.transcript)
             recorder.log_host_speech(event.transcript)
 
+    archive_tasks: set[asyncio.Task] = set()
+
+    async def archive_reply(text: str, reply_id: str | None, sentences: int | None) -> None:
+        audio_data = None
+        if reply_id is not None:
+            audio_data = await _pop_tts_audio(reply_id, sentences)
+        recorder.log_agent_response(text, audio_data=audio_data)
+
     @session.on("conversation_item_added")
-    async def on_item_added(event: ConversationItemAddedEvent):
+    def on_item_added(event: ConversationItemAddedEvent):
         if event.item.role == "assistant":
             text = event.item.text_content
             if text:
                 logger.info("[Agent] %s", text)
-                audio_data = await _pop_tts_audio()
-                recorder.log_agent_response(text, audio_data=audio_data)
+                # The item is added from inside its speech's task, so
+                # current_speech is the handle whose TTS streams produced it
+                speech = session.current_speech
+                reply = pipelined_tts.claim_reply(speech.id if speech is not None else None)
+                if reply is not None and reply.gaps.sentences:
+                    recorder.log_tts_gaps(reply.gaps.gaps)
+                # An interrupted reply keeps only the sentences that started playing;
+                # the rest were synthesized ahead and are dropped from the cache
+                sentences = reply.played(time.monotonic()) if reply and event.item.interrupted else None
+                task = asyncio.create_task(
+                    archive_reply(text, reply.reply_id if reply else None, sentences)
+                )
+                archive_tasks.add(task)
+                task.add_done_callback(archive_tasks.discard)
 
     # Handle disconnection
     @ctx.room.on("disconnected")
@@ -106,6 +143,16 @@ async def entrypoint(ctx: agents.JobContext):
         logger.warning("Disconnected from room")
         recorder.log_disconnect()
 
+    # Release per-job resources so a long-running worker doesn't accumulate
+    # push loops and handler closures across jobs.
+    async def on_shutdown():
+        avatar_task.cancel()
+        session.off("user_input_transcribed", on_user_transcribed)
+        session.off("conversation_item_added", on_item_added)
+        ctx.room.off("disconnected", on_disconnected)
+
+    ctx.add_shutdown_callback(on_shutdown)
+
     # Start the session
     await session.start(
         agent=PodcastGuest(cfg.agent.system_prompt),
@@ -118,11 +165,18 @@ async def entrypoint(ctx: agents.JobContext):
     )
 
 
-async def _pop_tts_audio() -> bytes | None:
-    """Pop cached TTS audio from the Supertonic wrapper for archival."""
+async def _pop_tts_audio(reply_id: str, sentences: int | None = None) -> bytes | None:
+    """Pop a reply's cached TTS audio from the Supertonic wrapper for archival.
+
+    With `sentences`, only that many leading sentences are returned; the
+    rest of the reply is still removed from the cache.
+    """
+    params = {"reply_id": reply_id}
+    if sentences is not None:
+        params["sentences"] = sentences
     try:
         async with httpx.AsyncClient() as client:
-            resp = await client.post(f"{cfg.tts.base_url.rstrip('/v1')}/v1/audio/pop")
+            resp = await client.post(f"{cfg.tts.base_url.rstrip('/v1')}/v1/audio/pop", params=params)
             if resp.status_code == 200:
                 return resp.content
     except Exception:
@@ -48,14 +48,22 @@ def render_frame(avatar_path: str, bg_color: str = "#000000") -> bytes:
     return canvas.tobytes("raw", "RGBA")
 
 
+async def push_frames(source: rtc.VideoSource, frame: rtc.VideoFrame, interval: float = 1.0 / FPS) -> None:
+    """Push the same frame to the source forever. Cancel the task to stop."""
+    while True:
+        source.capture_frame(frame)
+        await asyncio.sleep(interval)
+
+
 async def publish_avatar(
     room: rtc.Room,
     avatar_path: str,
     bg_color: str = "#000000",
-) -> rtc.VideoSource:
+) -> tuple[rtc.VideoSource, asyncio.Task]:
     """Publish a static avatar as a video track in the room.
 
-    Returns the VideoSource for potential future animation use.
+    Returns the VideoSource (for potential future animation use) and the
+    frame push task, which the caller must cancel when the job ends.
     """
     frame_data = render_frame(avatar_path, bg_color)
 
@@ -71,10 +79,5 @@ async def publish_avatar(
         frame_data,
     )
 
-    async def _push_loop():
-        while True:
-            source.capture_frame(frame)
-            await asyncio.sleep(1.0 / FPS)
-
-    asyncio.create_task(_push_loop())
-    return source
+    task = asyncio.create_task(push_frames(source, frame), name="avatar-push")
+    return source, task
@@ -52,6 +52,7 @@ class TTSConfig:
     base_url: str = "http://localhost:8200/v1"
     voice: str = "M1"
     speed: float = 1.2
+    lookahead: int = 2  # Sentences synthesizing ahead of playback
 
 
 @dataclass
@@ -69,6 +70,16 @@ class EgressConfig:
     resolution: str = "1280x720"
 
 
+@dataclass
+class RenderConfig:
+    target_lufs: float = -16.0
+    silence_threshold_db: float = -45.0
+    max_silence: float = 1.0
+    chunk_seconds: float = 30.0
+    offset: float = 0.0
+    workers: int = 0  # 0 = one per CPU
+
+
 @dataclass
 class ClawcastConfig:
     livekit: LiveKitConfig = field(default_factory=LiveKitConfig)
@@ -78,6 +89,7 @@ class ClawcastConfig:
     tts: TTSConfig = field(default_factory=TTSConfig)
     vad: VADConfig = field(default_factory=VADConfig)
     egress: EgressConfig = field(default_factory=EgressConfig)
+    render: RenderConfig = field(default_factory=RenderConfig)
 
 
 # Maps section names to their dataclass types
@@ -89,6 +101,7 @@ _SECTION_CLASSES = {
     "tts": TTSConfig,
     "vad": VADConfig,
     "egress": EgressConfig,
+    "render": RenderConfig,
 }
 
 
@@ -0,0 +1,66 @@
+"""Process memory sampling — RSS, tracemalloc, and GC counters.
+
+Shared by the API wrappers' optional /debug/memory endpoint and the
+soak-test harness (src/soak.py).
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import resource
+import sys
+import tracemalloc
+
+
+def rss_bytes() -> int:
+    """Current resident set size in bytes.
+
+    Reads /proc/self/statm on Linux. Elsewhere falls back to peak RSS
+    from getrusage, which only ever grows but still shows leaks.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes on Linux/BSD
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def snapshot() -> dict:
+    """Sample RSS plus tracemalloc totals (when tracing) and GC counts."""
+    stats = {
+        "rss_bytes": rss_bytes(),
+        "gc_objects": len(gc.get_objects()),
+        "gc_counts": list(gc.get_count()),
+        "tracemalloc": tracemalloc.is_tracing(),
+    }
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        stats["traced_current_bytes"] = current
+        stats["traced_peak_bytes"] = peak
+    return stats
+
+
+def top_allocations(limit: int = 10) -> list[str]:
+    """Top allocation sites by size, grouped by source line."""
+    if not tracemalloc.is_tracing():
+        return []
+    stats = tracemalloc.take_snapshot().statistics("lineno")
+    return [str(stat) for stat in stats[:limit]]
+
+
+def growth_slope(xs: list[float], ys: list[float]) -> float:
+    """Least-squares slope of ys over xs. Returns 0.0 with fewer than 2 points."""
+    n = len(xs)
+    if n < 2:
+        return 0.0
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return 0.0
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return cov / var_x
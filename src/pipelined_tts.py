@@ -0,0 +1,218 @@
+"""Sentence-pipelined TTS adapter.
+
+LiveKit wraps a non-streaming TTS (like openai.TTS) in a StreamAdapter
+that synthesizes one sentence at a time: sentence N+1 is only requested
+once sentence N has fully arrived, so a slow render shows up as a gap
+between sentences. This adapter requests each sentence as soon as the
+tokenizer emits it, up to `lookahead` sentences ahead of the one being
+played, and pushes them out in order. Concurrent requests also let the
+Supertonic wrapper coalesce them into one batched pass.
+
+Each sentence request carries X-Reply-Id / X-Reply-Seq headers (added by
+`tag_reply_request`, installed as an httpx request hook on the wrapped
+TTS's client), so the agent can pop a reply's archival audio by id.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import httpx
+from livekit import rtc
+from livekit.agents import tts, utils
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS, APIConnectOptions
+
+logger = logging.getLogger("clawcast.tts")
+
+# (reply id, sentence index) for the sentence being fetched in this task
+_reply_tag: contextvars.ContextVar[tuple[str, int] | None] = contextvars.ContextVar(
+    "clawcast_reply_tag", default=None
+)
+
+
+async def tag_reply_request(request: httpx.Request) -> None:
+    """httpx request hook: label a TTS request with its reply and sentence index."""
+    if (tag := _reply_tag.get()) is not None:
+        reply_id, seq = tag
+        request.headers["X-Reply-Id"] = reply_id
+        request.headers["X-Reply-Seq"] = str(seq)
+
+
+def _current_speech_id() -> str | None:
+    """Id of the SpeechHandle this stream is synthesizing for, if any.
+
+    LiveKit runs each reply's TTS inside its speech task's context and
+    reads the same context variable to tag TTSMetrics.speech_id.
+    """
+    try:
+        from livekit.agents.voice.agent_activity import _SpeechHandleContextVar
+    except ImportError:
+        return None
+    handle = _SpeechHandleContextVar.get(None)
+    return handle.id if handle is not None else None
+
+
+@dataclass
+class ReplyGaps:
+    """Inter-sentence gaps for one reply: time between the estimated end of
+    sentence N's playout and sentence N+1's audio being ready (0 if it was
+    ready in time)."""
+
+    sentences: int = 0
+    gaps: list[float] = field(default_factory=list)
+
+    @property
+    def total(self) -> float:
+        return sum(self.gaps)
+
+    @property
+    def max(self) -> float:
+        return max(self.gaps, default=0.0)
+
+
+@dataclass
+class FinishedReply:
+    """A finished TTS stream, as tagged on its wrapper requests."""
+
+    reply_id: str
+    starts: list[float] = field(default_factory=list)  # Estimated playout start per pushed sentence
+    gaps: ReplyGaps = field(default_factory=ReplyGaps)
+
+    def played(self, at: float) -> int:
+        """Sentences whose playout had started by monotonic time `at`."""
+        return sum(1 for start in self.starts if start <= at)
+
+
+class PipelinedTTS(tts.StreamAdapter):
+    """StreamAdapter that keeps upcoming sentences synthesizing during playback."""
+
+    def __init__(self, *, tts: tts.TTS, lookahead: int = 2) -> None:
+        super().__init__(tts=tts)
+        self._lookahead = max(lookahead, 1)
+        # Finished replies per speech id, oldest first. A speech with tool
+        # calls runs one stream per step, each adding its own message.
+        self._replies: dict[str | None, deque[FinishedReply]] = {}
+
+    def claim_reply(self, speech_id: str | None) -> FinishedReply | None:
+        """Oldest unclaimed reply synthesized for `speech_id`, or None."""
+        replies = self._replies.get(speech_id)
+        if not replies:
+            return None
+        reply = replies.popleft()
+        if not replies:
+            del self._replies[speech_id]
+        return reply
+
+    def _add_reply(self, speech_id: str | None, reply: FinishedReply) -> None:
+        self._replies.setdefault(speech_id, deque()).append(reply)
+        while len(self._replies) > 16:  # Speeches that never added a message
+            del self._replies[next(iter(self._replies))]
+
+    def stream(
+        self, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS
+    ) -> PipelinedStream:
+        return PipelinedStream(tts=self, conn_options=conn_options)
+
+
+class PipelinedStream(tts.StreamAdapterWrapper):
+    def __init__(self, *, tts: PipelinedTTS, conn_options: APIConnectOptions) -> None:
+        super().__init__(tts=tts, conn_options=conn_options)
+        self._tts: PipelinedTTS = tts
+
+    async def _fetch(self, text: str, tag: tuple[str, int]) -> list[rtc.AudioFrame]:
+        """Synthesize one sentence and collect its frames."""
+        _reply_tag.set(tag)  # Task-local: each fetch runs in its own context copy
+        async with self._tts._wrapped_tts.synthesize(
+            text, conn_options=self._wrapped_tts_conn_options
+        ) as tts_stream:
+            return [audio.frame async for audio in tts_stream]
+
+    async def _run(self, output_emitter: tts.AudioEmitter) -> None:
+        from livekit.agents.voice.io import TimedString
+
+        sent_stream = self._tts._sentence_tokenizer.stream()
+        reply = FinishedReply(reply_id=utils.shortuuid())
+        speech_id = _current_speech_id()
+
+        output_emitter.initialize(
+            request_id=reply.reply_id,
+            sample_rate=self._tts.sample_rate,
+            num_channels=self._tts.num_channels,
+            mime_type="audio/pcm",
+            stream=True,
+        )
+        output_emitter.start_segment(segment_id=utils.shortuuid())
+
+        # (token, synthesis task or None for whitespace), in sentence order.
+        # A slot is taken before each synthesis starts and freed when _play
+        # picks that sentence up, so at most `lookahead` render ahead.
+        pending: asyncio.Queue[tuple[str, asyncio.Task | None] | None] = asyncio.Queue()
+        slots = asyncio.Semaphore(self._tts._lookahead)
+        fetches: list[asyncio.Task] = []
+        stats = reply.gaps
+
+        async def _forward_input() -> None:
+            async for data in self._input_ch:
+                if isinstance(data, self._FlushSentinel):
+                    sent_stream.flush()
+                    continue
+                sent_stream.push_text(data)
+            sent_stream.end_input()
+
+        async def _schedule() -> None:
+            async for ev in sent_stream:
+                task = None
+                if text := ev.token.strip():
+                    await slots.acquire()
+                    task = asyncio.create_task(self._fetch(text, (reply.reply_id, len(fetches))))
+                    fetches.append(task)
+                pending.put_nowait((ev.token, task))
+            pending.put_nowait(None)
+
+        async def _play() -> None:
+            duration = 0.0
+            playout_end: float | None = None  # Estimated, from pushed audio length
+            while (item := await pending.get()) is not None:
+                token, task = item
+                output_emitter.push_timed_transcript(TimedString(text=token, start_time=duration))
+                if task is None:
+                    continue
+
+                slots.release()
+                frames = await task
+                now = time.monotonic()
+                if playout_end is not None:
+                    stats.gaps.append(max(now - playout_end, 0.0))
+                stats.sentences += 1
+                reply.starts.append(max(now, playout_end or now))
+
+                sentence_duration = 0.0
+                for frame in frames:
+                    output_emitter.push(frame.data.tobytes())
+                    sentence_duration += frame.duration
+                output_emitter.flush()
+                duration += sentence_duration
+                playout_end = max(now, playout_end or now) + sentence_duration
+
+        tasks = [
+            asyncio.create_task(_forward_input()),
+            asyncio.create_task(_schedule()),
+            asyncio.create_task(_play()),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            await sent_stream.aclose()
+            await utils.aio.cancel_and_wait(*tasks, *fetches)
+            if fetches:
+                self._tts._add_reply(speech_id, reply)
+            if stats.sentences:
+                logger.info(
+                    "TTS reply: %d sentences, inter-sentence gap total %.0f ms, max %.0f ms",
+                    stats.sentences, stats.total * 1000, stats.max * 1000,
+                )
@@ -0,0 +1,595 @@
+"""Post-session podcast audio render.
+
+Rebuilds a clean audio track from a session folder: the host audio
+extracted from the egress MP4 as the bed, with the agent's archived
+TTS clips (audio/*.wav) laid over the spans where the agent spoke.
+Each clip is aligned against the bed by cross-correlation first; clips
+with no clear match leave the bed as recorded. The result is loudness-normalized (ITU-R BS.1770 integrated loudness)
+and long silences are shortened.
+
+Work is split into fixed-length chunks processed in a process pool,
+in two passes: measure (loudness + silence per 100ms block), then
+render. Output is streamed to disk in order, so memory stays bounded
+regardless of session length. Local files only; needs `ffmpeg` to
+decode the MP4.
+
+Usage:
+    python -m src.render <session> [--mp4 PATH] [--offset SECONDS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import scipy.io.wavfile
+import scipy.signal
+
+from src.config import load_config
+
+logger = logging.getLogger("clawcast.render")
+
+SAMPLE_RATE = 44100  # Supertonic's native rate; host audio is resampled to match
+BLOCK = SAMPLE_RATE // 10  # 100ms analysis block
+PREROLL_BLOCKS = 5  # Warm up the K-weighting filter across chunk boundaries
+CROSSFADE = int(0.01 * SAMPLE_RATE)
+CUT_FADE = int(0.005 * SAMPLE_RATE)
+PEAK_CEILING = 10 ** (-1.0 / 20)  # -1 dBFS
+ALIGN_SEARCH = 2.0  # Seconds either side of the transcript position searched for each clip
+ALIGN_MIN_SCORE = 0.5  # Normalized cross-correlation below this leaves the bed untouched
+
+# "## [MM:SS] Host", "## [MM:SS] Agent → `000_00m18s_intro.wav`", ...
+# "## [MM:SS] ✅ Agent reconnected (resuming)"
+_REJOIN_RE = re.compile(r"^## \[(\d+):(\d{2})\] ✅ ", re.MULTILINE)
+_ENTRY_RE = re.compile(r"^## \[(\d+):(\d{2})\](?: Agent → `([^`]+)`)?", re.MULTILINE)
+
+
+@dataclass
+class Clip:
+    path: str
+    start: int  # Session-relative start, in samples
+    length: int
+
+
+@dataclass
+class RenderPlan:
+    """Everything a worker needs to mix any chunk of the session."""
+
+    total: int  # Session length in samples
+    chunk: int  # Chunk length in samples (multiple of BLOCK)
+    clips: list[Clip] = field(default_factory=list)
+    host_path: str | None = None
+    host_offset: int = 0  # Where host audio sample 0 sits on the session timeline
+
+    @property
+    def num_chunks(self) -> int:
+        return math.ceil(self.total / self.chunk)
+
+
+@dataclass
+class RenderResult:
+    output: Path
+    input_seconds: float
+    output_seconds: float
+    loudness: float
+    gain_db: float
+    elapsed: float
+
+
+# -- Timeline -----------------------------------------------------------------
+
+
+def _wav_length(path: Path) -> tuple[int, int]:
+    """Frame count and sample rate from a WAV header."""
+    with wave.open(str(path), "rb") as w:
+        return w.getnframes(), w.getframerate()
+
+
+def load_timeline(session_dir: Path) -> list[Clip]:
+    """Place each archived agent clip on the session timeline.
+
+    Transcript timestamps are logged once the agent's reply has been
+    added to the conversation, i.e. when playout ends, so each clip is
+    anchored to end at its timestamp. That is only approximate (whole
+    seconds, logged after the audio pop); align_clips refines it.
+    Clips longer than the time since the previous transcript entry are
+    logged, as they likely don't belong to that reply.
+    """
+    content = (session_dir / "transcript.md").read_text()
+    clips = []
+    prev = 0
+    for m in _ENTRY_RE.finditer(content):
+        ts = int(m[1]) * 60 + int(m[2])
+        if filename := m[3]:
+            path = session_dir / "audio" / filename
+            if not path.exists():
+                logger.warning("Missing agent clip: %s", path)
+            else:
+                frames, rate = _wav_length(path)
+                length = round(frames * SAMPLE_RATE / rate)
+                slot = ts - prev + 1  # Both timestamps are truncated to the second
+                if length / SAMPLE_RATE > slot + ALIGN_SEARCH:
+                    logger.warning(
+                        "Agent clip %s is %.1fs but its reply slot is only %ds",
+                        filename, length / SAMPLE_RATE, slot,
+                    )
+                end = ts * SAMPLE_RATE
+                clips.append(Clip(path=str(path), start=max(end - length, 0), length=length))
+        prev = ts
+    return clips
+
+
+def _best_match(audio: np.ndarray, bed: np.ndarray) -> tuple[float, int]:
+    """Peak normalized cross-correlation of audio within bed, and its offset."""
+    if len(bed) < len(audio) or not len(audio):
+        return 0.0, 0
+    corr = scipy.signal.correlate(bed, audio, mode="valid", method="fft")
+    energy = np.concatenate([[0.0], np.cumsum(bed ** 2)])
+    window = energy[len(audio):] - energy[:-len(audio)]
+    norm = np.sqrt(np.maximum(window, 0.0) * np.dot(audio, audio))
+    score = corr / np.maximum(norm, 1e-12)
+    best = int(np.argmax(score))
+    return float(score[best]), best
+
+
+def align_clips(clips: list[Clip], host_path: str, host_offset: int) -> list[Clip]:
+    """Snap each clip to where the agent's audio actually sits in the host bed.
+
+    Searches ALIGN_SEARCH seconds either side of the transcript position.
+    Clips scoring below ALIGN_MIN_SCORE are dropped, so that stretch of
+    the bed (which may be host speech) is left as recorded.
+    """
+    _, host = scipy.io.wavfile.read(host_path, mmap=True)
+    search = int(ALIGN_SEARCH * SAMPLE_RATE)
+    aligned = []
+    for clip in clips:
+        lo = max(clip.start - search - host_offset, 0)
+        hi = min(clip.start + clip.length + search - host_offset, len(host))
+        if hi <= lo:
+            # Outside the recording (e.g. before the last rejoin): no bed to protect
+            aligned.append(clip)
+            continue
+        audio = _read_wav(clip.path)[:clip.length].astype(np.float64)
+        bed = host[lo:hi].astype(np.float64) / 32768.0
+        score, shift = _best_match(audio, bed)
+        name = Path(clip.path).name
+        if score < ALIGN_MIN_SCORE:
+            logger.warning(
+                "No match for agent clip %s near %.1fs (score %.2f) — keeping host audio there",
+                name, clip.start / SAMPLE_RATE, score,
+            )
+            continue
+        start = host_offset + lo + shift
+        logger.debug("Aligned %s by %+.3fs (score %.2f)", name, (start - clip.start) / SAMPLE_RATE, score)
+        aligned.append(Clip(path=clip.path, start=start, length=clip.length))
+    return aligned
+
+
+def last_join_time(session_dir: Path) -> float:
+    """Session time, in seconds, at which the last agent job joined.
+
+    Each rejoin restarts egress to the same <room_id>.mp4, so the MP4
+    only covers the last job. The transcript keeps counting across
+    rejoins, and the "reconnected" entry marks where that job began.
+    """
+    matches = _REJOIN_RE.findall((session_dir / "transcript.md").read_text())
+    if not matches:
+        return 0.0
+    m, s = matches[-1]
+    return float(int(m) * 60 + int(s))
+
+
+def find_mp4(session_dir: Path) -> Path | None:
+    """Locate the egress recording for a session.
+
+    Egress writes <output_dir>/<room_id>.mp4 next to the session folder;
+    an MP4 moved inside the session folder is also accepted.
+    """
+    inside = sorted(session_dir.glob("*.mp4"))
+    if inside:
+        return inside[0]
+    room_id = session_dir.name.split("_", 1)[-1]
+    metadata_path = session_dir / "session.json"
+    if metadata_path.exists():
+        room_id = json.loads(metadata_path.read_text()).get("room_id", room_id)
+    candidate = session_dir.parent / f"{room_id}.mp4"
+    return candidate if candidate.exists() else None
+
+
+def extract_host_audio(mp4: Path, dest: Path) -> None:
+    """Decode the MP4's audio track to mono 16-bit WAV at SAMPLE_RATE."""
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("ffmpeg not found — required to extract audio from the egress MP4")
+    try:
+        subprocess.run(
+            [
+                "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+                "-i", str(mp4), "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+                "-acodec", "pcm_s16le", str(dest),
+            ],
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(
+            f"ffmpeg could not extract audio from {mp4} (exit {e.returncode}) — does it have an audio track?"
+        ) from None
+
+
+# -- Worker side --------------------------------------------------------------
+
+_plan: RenderPlan | None = None
+
+
+def _init_worker(plan: RenderPlan) -> None:
+    global _plan
+    _plan = plan
+
+
+def _read_wav(path: str) -> np.ndarray:
+    """Memory-map a WAV and return mono float32 at SAMPLE_RATE."""
+    rate, data = scipy.io.wavfile.read(path, mmap=True)
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    if data.dtype == np.int16:
+        data = data.astype(np.float32) / 32768.0
+    else:
+        data = data.astype(np.float32)
+    if rate != SAMPLE_RATE:
+        g = math.gcd(SAMPLE_RATE, rate)
+        data = scipy.signal.resample_poly(data, SAMPLE_RATE // g, rate // g).astype(np.float32)
+    return data
+
+
+def _mix(start: int, end: int) -> np.ndarray:
+    """Mix session samples [start, end): host bed with agent clips crossfaded over it."""
+    plan = _plan
+    out = np.zeros(end - start, dtype=np.float32)
+
+    if plan.host_path is not None:
+        _, host = scipy.io.wavfile.read(plan.host_path, mmap=True)
+        lo = max(start - plan.host_offset, 0)
+        hi = min(end - plan.host_offset, len(host))
+        if hi > lo:
+            dst = lo + plan.host_offset - start
+            out[dst:dst + hi - lo] = host[lo:hi].astype(np.float32) / 32768.0
+
+    for clip in plan.clips:
+        clip_end = clip.start + clip.length
+        if clip_end <= start or clip.start >= end:
+            continue
+        audio = _read_wav(clip.path)[:clip.length]
+        # Crossfade weight over the whole clip, sliced to this chunk
+        weight = np.ones(len(audio), dtype=np.float32)
+        ramp = min(CROSSFADE, len(audio) // 2)
+        if ramp:
+            weight[:ramp] = np.linspace(0.0, 1.0, ramp, dtype=np.float32)
+            weight[-ramp:] = np.linspace(1.0, 0.0, ramp, dtype=np.float32)
+        lo = max(start, clip.start)
+        hi = min(end, clip.start + len(audio))
+        src = slice(lo - clip.start, hi - clip.start)
+        dst = slice(lo - start, hi - start)
+        # Replace rather than add: the egress mix already contains the agent
+        out[dst] = out[dst] * (1.0 - weight[src]) + audio[src] * weight[src]
+
+    return out
+
+
+def _k_weighting() -> np.ndarray:
+    """BS.1770 K-weighting (high shelf + high pass) as second-order sections."""
+    # High shelf: +4 dB above ~1.5 kHz
+    gain_db, q, fc = 4.0, 1 / math.sqrt(2), 1500.0
+    a = 10 ** (gain_db / 40)
+    w0 = 2 * math.pi * fc / SAMPLE_RATE
+    alpha = math.sin(w0) / (2 * q)
+    cos_w0 = math.cos(w0)
+    shelf = [
+        a * ((a + 1) + (a - 1) * cos_w0 + 2 * math.sqrt(a) * alpha),
+        -2 * a * ((a - 1) + (a + 1) * cos_w0),
+        a * ((a + 1) + (a - 1) * cos_w0 - 2 * math.sqrt(a) * alpha),
+        (a + 1) - (a - 1) * cos_w0 + 2 * math.sqrt(a) * alpha,
+        2 * ((a - 1) - (a + 1) * cos_w0),
+        (a + 1) - (a - 1) * cos_w0 - 2 * math.sqrt(a) * alpha,
+    ]
+    # High pass: ~38 Hz
+    q, fc = 0.5, 38.0
+    w0 = 2 * math.pi * fc / SAMPLE_RATE
+    alpha = math.sin(w0) / (2 * q)
+    cos_w0 = math.cos(w0)
+    highpass = [
+        (1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2,
+        1 + alpha, -2 * cos_w0, 1 - alpha,
+    ]
+    sos = np.array([shelf, highpass])
+    sos[:, :3] /= sos[:, 3:4]
+    sos[:, 3:] /= sos[:, 3:4]
+    return sos
+
+
+def _block_means(x: np.ndarray) -> np.ndarray:
+    """Mean of x per 100ms block (last block may be short)."""
+    n = math.ceil(len(x) / BLOCK)
+    padded = np.zeros(n * BLOCK, dtype=np.float64)
+    padded[:len(x)] = x
+    sums = padded.reshape(n, BLOCK).sum(axis=1)
+    counts = np.full(n, BLOCK, dtype=np.float64)
+    counts[-1] = len(x) - (n - 1) * BLOCK
+    return sums / counts
+
+
+def _analyze_chunk(index: int) -> tuple[int, np.ndarray, np.ndarray, float]:
+    """Per-block K-weighted and plain mean square for one chunk, plus its sample peak."""
+    start = index * _plan.chunk
+    end = min(start + _plan.chunk, _plan.total)
+    pre = min(start, PREROLL_BLOCKS * BLOCK)
+    audio = _mix(start - pre, end)
+    weighted = scipy.signal.sosfilt(_k_weighting(), audio)[pre:]
+    audio = audio[pre:]
+    peak = float(np.abs(audio).max(initial=0.0))
+    return index, _block_means(weighted ** 2), _block_means(audio.astype(np.float64) ** 2), peak
+
+
+def _render_chunk(index: int, gain: float, keep: np.ndarray) -> bytes:
+    """Render one chunk as int16 PCM: gain, peak ceiling, silence cuts.
+
+    `keep` has one flag per block in the chunk, padded with the
+    neighbouring chunks' first/last flag so fades land on cut edges.
+    """
+    start = index * _plan.chunk
+    end = min(start + _plan.chunk, _plan.total)
+    # Gain is capped so the peak stays under the ceiling; the clip is a safety net
+    audio = np.clip(_mix(start, end) * gain, -PEAK_CEILING, PEAK_CEILING)
+
+    pieces = []
+    flags = keep[1:-1]
+    i = 0
+    while i < len(flags):
+        if not flags[i]:
+            i += 1
+            continue
+        j = i
+        while j < len(flags) and flags[j]:
+            j += 1
+        piece = audio[i * BLOCK:j * BLOCK].copy()
+        fade = min(CUT_FADE, len(piece) // 2)
+        if fade and not keep[i]:  # Block before this run was cut
+            piece[:fade] *= np.linspace(0.0, 1.0, fade, dtype=np.float32)
+        if fade and not keep[j + 1]:  # Block after this run is cut
+            piece[-fade:] *= np.linspace(1.0, 0.0, fade, dtype=np.float32)
+        pieces.append(piece)
+        i = j
+
+    if not pieces:
+        return b""
+    return (np.concatenate(pieces) * 32767).astype("<i2").tobytes()
+
+
+# -- Parent side --------------------------------------------------------------
+
+
+def integrated_loudness(weighted_ms: np.ndarray) -> float:
+    """BS.1770 gated integrated loudness (LUFS) from 100ms K-weighted mean squares.
+
+    400ms gating blocks with 75% overlap are exactly the mean of four
+    consecutive 100ms blocks.
+    """
+    if len(weighted_ms) < 4:
+        return -math.inf
+    z = np.convolve(weighted_ms, np.ones(4) / 4, mode="valid")
+    with np.errstate(divide="ignore"):
+        loudness = -0.691 + 10 * np.log10(z)
+    z = z[loudness > -70.0]
+    if len(z) == 0:
+        return -math.inf
+    relative_gate = -0.691 + 10 * math.log10(z.mean()) - 10.0
+    with np.errstate(divide="ignore"):
+        z = z[-0.691 + 10 * np.log10(z) > relative_gate]
+    return -0.691 + 10 * math.log10(z.mean())
+
+
+def silence_keep_mask(plain_ms: np.ndarray, threshold_db: float, max_silence: float) -> np.ndarray:
+    """Per-block keep flags: silent runs longer than max_silence are cut down to it.
+
+    Half of the allowed silence is kept at each end of a long run so
+    speech tails and breaths stay intact.
+    """
+    with np.errstate(divide="ignore"):
+        silent = 10 * np.log10(plain_ms) < threshold_db
+    keep = np.ones(len(silent), dtype=bool)
+    max_blocks = int(round(max_silence * SAMPLE_RATE / BLOCK))
+    head = max_blocks // 2
+    tail = max_blocks - head
+    i = 0
+    while i < len(silent):
+        if not silent[i]:
+            i += 1
+            continue
+        j = i
+        while j < len(silent) and silent[j]:
+            j += 1
+        if j - i > max_blocks:
+            keep[i + head:j - tail] = False
+        i = j
+    return keep
+
+
+def render_session(
+    session_dir: Path,
+    output: Path | None = None,
+    mp4: Path | None = None,
+    offset: float = 0.0,
+    target_lufs: float = -16.0,
+    silence_threshold_db: float = -45.0,
+    max_silence: float = 1.0,
+    chunk_seconds: float = 30.0,
+    workers: int | None = None,
+) -> RenderResult:
+    """Render a session folder to a single normalized WAV.
+
+    Raises FileNotFoundError if there is no MP4 and no clips, and
+    RuntimeError if ffmpeg fails or the session has no audio at all.
+    """
+    t0 = time.monotonic()
+    output = output or session_dir / "podcast.wav"
+    clips = load_timeline(session_dir)
+    mp4 = mp4 or find_mp4(session_dir)
+    if mp4 is None:
+        logger.warning("No egress MP4 found — rendering agent clips only")
+    if mp4 is None and not clips:
+        raise FileNotFoundError(f"Nothing to render in {session_dir}")
+
+    # `offset` is relative to the last (re)join, where the MP4 begins
+    joined = last_join_time(session_dir)
+    if mp4 is not None and joined > 0:
+        logger.warning(
+            "Session has rejoins: the MP4 only covers the last job, from [%02d:%02d]. "
+            "Earlier agent clips are rendered without host audio",
+            int(joined) // 60, int(joined) % 60,
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plan = RenderPlan(
+            total=0,
+            chunk=max(int(round(chunk_seconds * 10)), 1) * BLOCK,
+            clips=clips,
+            host_offset=int(round((joined + offset) * SAMPLE_RATE)),
+        )
+        if mp4 is not None:
+            plan.host_path = str(Path(tmp) / "host.wav")
+            logger.info("Extracting host audio from %s", mp4)
+            extract_host_audio(mp4, Path(plan.host_path))
+            host_frames, _ = _wav_length(Path(plan.host_path))
+            plan.total = plan.host_offset + host_frames
+            plan.clips = align_clips(clips, plan.host_path, plan.host_offset)
+        plan.total = max([plan.total] + [c.start + c.length for c in plan.clips])
+        if plan.total == 0:
+            raise RuntimeError(f"Nothing to render in {session_dir}: host track and agent clips are empty")
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(plan,)) as pool:
+            # Pass 1: measure
+            weighted = [None] * plan.num_chunks
+            plain = [None] * plan.num_chunks
+            peak = 0.0
+            for index, w, p, chunk_peak in pool.map(_analyze_chunk, range(plan.num_chunks)):
+                weighted[index] = w
+                plain[index] = p
+                peak = max(peak, chunk_peak)
+            blocks_per_chunk = plan.chunk // BLOCK
+            loudness = integrated_loudness(np.concatenate(weighted))
+            gain_db = 0.0 if math.isinf(loudness) else target_lufs - loudness
+            if peak > 0:
+                # No limiter: cap the gain so the loudest sample lands at the ceiling
+                headroom_db = 20 * math.log10(PEAK_CEILING / peak)
+                if gain_db > headroom_db:
+                    logger.warning(
+                        "Peak %.1f dBFS limits gain to %+.1f dB (output %.1f LUFS, target %.1f)",
+                        20 * math.log10(peak), headroom_db, loudness + headroom_db, target_lufs,
+                    )
+                    gain_db = headroom_db
+            keep = silence_keep_mask(np.concatenate(plain), silence_threshold_db, max_silence)
+            keep = np.concatenate([[True], keep, [True]])
+            logger.info("Integrated loudness %.1f LUFS, applying %+.1f dB", loudness, gain_db)
+
+            # Pass 2: render, writing chunks in order with a bounded window in flight
+            gain = 10 ** (gain_db / 20)
+            window = 2 * (workers or os.cpu_count() or 1)
+            pending: deque = deque()
+            written = 0
+            with wave.open(str(output), "wb") as out:
+                out.setnchannels(1)
+                out.setsampwidth(2)
+                out.setframerate(SAMPLE_RATE)
+                for index in range(plan.num_chunks):
+                    lo = index * blocks_per_chunk
+                    hi = min(lo + blocks_per_chunk, len(keep) - 2)
+                    pending.append(pool.submit(_render_chunk, index, gain, keep[lo:hi + 2]))
+                    if len(pending) >= window:
+                        data = pending.popleft().result()
+                        out.writeframes(data)
+                        written += len(data) // 2
+                while pending:
+                    data = pending.popleft().result()
+                    out.writeframes(data)
+                    written += len(data) // 2
+
+    return RenderResult(
+        output=output,
+        input_seconds=plan.total / SAMPLE_RATE,
+        output_seconds=written / SAMPLE_RATE,
+        loudness=loudness,
+        gain_db=gain_db,
+        elapsed=time.monotonic() - t0,
+    )
+
+
+def _resolve_session(name: str, output_dir: str) -> Path:
+    """Accept a session folder path or a folder name under the sessions dir."""
+    path = Path(name)
+    if path.is_dir():
+        return path
+    path = Path(output_dir) / name
+    if path.is_dir():
+        return path
+    raise FileNotFoundError(f"Session not found: {name}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    cfg = load_config()
+    parser = argparse.ArgumentParser(description="Render a session folder to a clean podcast audio track")
+    parser.add_argument("session", help="Session folder, or its name under the sessions directory")
+    parser.add_argument("--output", type=Path, default=None, help="Output WAV (default: <session>/podcast.wav)")
+    parser.add_argument("--mp4", type=Path, default=None, help="Egress recording (default: auto-detect)")
+    parser.add_argument("--offset", type=float, default=cfg.render.offset,
+                        help="Seconds after the last agent (re)join at which the MP4 starts")
+    parser.add_argument("--target-lufs", type=float, default=cfg.render.target_lufs)
+    parser.add_argument("--max-silence", type=float, default=cfg.render.max_silence,
+                        help="Longest silence kept, in seconds")
+    parser.add_argument("--workers", type=int, default=cfg.render.workers or None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    try:
+        session_dir = _resolve_session(args.session, cfg.egress.output_dir)
+    except FileNotFoundError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    try:
+        result = render_session(
+            session_dir,
+            output=args.output,
+            mp4=args.mp4,
+            offset=args.offset,
+            target_lufs=args.target_lufs,
+            silence_threshold_db=cfg.render.silence_threshold_db,
+            max_silence=args.max_silence,
+            chunk_seconds=cfg.render.chunk_seconds,
+            workers=args.workers,
+        )
+    except (FileNotFoundError, RuntimeError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(
+        f"Wrote {result.output} — {result.input_seconds / 60:.1f} min in, "
+        f"{result.output_seconds / 60:.1f} min out, {result.gain_db:+.1f} dB, "
+        f"rendered in {result.elapsed:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,11 @@ import re
 import unicodedata
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
 
 
 def _slugify(text: str, max_words: int = 4) -> str:
@@ -38,9 +43,15 @@ def _format_file_timestamp(seconds: float) -> str:
 class SessionRecorder:
     """Manages a single session's recordings and transcript."""
 
-    def __init__(self, room_id: str, output_dir: str = "./sessions"):
+    def __init__(
+        self,
+        room_id: str,
+        output_dir: str = "./sessions",
+        clock: Callable[[], datetime] = _utcnow,
+    ):
         self.room_id = room_id
-        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        self._clock = clock  # Injectable so the soak harness can simulate time
+        today = self._clock().strftime("%Y-%m-%d")
         self.session_dir = Path(output_dir) / f"{today}_{room_id}"
         self.audio_dir = self.session_dir / "audio"
         self.transcript_path = self.session_dir / "transcript.md"
@@ -63,7 +74,7 @@ class SessionRecorder:
             self._write_transcript_header()
             self._write_metadata(is_new=True)
 
-        self._start_time = datetime.now(timezone.utc)
+        self._start_time = self._clock()
 
         if is_rejoin:
             self._append_transcript_event("Agent reconnected (resuming)")
@@ -90,12 +101,12 @@ class SessionRecorder:
         """Seconds since session start, plus any offset from rejoins."""
         if self._start_time is None:
             return self._time_offset
-        delta = (datetime.now(timezone.utc) - self._start_time).total_seconds()
+        delta = (self._clock() - self._start_time).total_seconds()
         return self._time_offset + delta
 
     def _write_transcript_header(self) -> None:
         """Write the initial transcript header."""
-        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        today = self._clock().strftime("%Y-%m-%d")
         header = (
             f"# Podcast Transcript\n"
             f"**Room:** {self.room_id}\n"
@@ -107,7 +118,7 @@ class SessionRecorder:
 
     def _write_metadata(self, is_new: bool = True) -> None:
         """Write or update session.json."""
-        now_iso = datetime.now(timezone.utc).isoformat()
+        now_iso = self._clock().isoformat()
         if is_new:
             metadata = {
                 "room_id": self.room_id,
@@ -129,9 +140,9 @@ class SessionRecorder:
         metadata = self._load_metadata()
         # Close previous session
         if metadata["rejoins"] and metadata["rejoins"][-1]["left_at"] is None:
-            metadata["rejoins"][-1]["left_at"] = datetime.now(timezone.utc).isoformat()
+            metadata["rejoins"][-1]["left_at"] = self._clock().isoformat()
         metadata["rejoins"].append({
-            "joined_at": datetime.now(timezone.utc).isoformat(),
+            "joined_at": self._clock().isoformat(),
             "left_at": None,
         })
         self.metadata_path.write_text(json.dumps(metadata, indent=2))
@@ -178,12 +189,21 @@ class SessionRecorder:
 
         return audio_filename
 
+    def log_tts_gaps(self, gaps: list[float]) -> None:
+        """Add one reply's inter-sentence TTS gaps (seconds) to the totals in session.json."""
+        metadata = self._load_metadata()
+        totals = metadata.setdefault("tts_gaps", {"replies": 0, "total_ms": 0.0, "max_ms": 0.0})
+        totals["replies"] += 1
+        totals["total_ms"] = round(totals["total_ms"] + sum(gaps) * 1000, 1)
+        totals["max_ms"] = round(max([totals["max_ms"]] + [g * 1000 for g in gaps]), 1)
+        self.metadata_path.write_text(json.dumps(metadata, indent=2))
+
     def log_disconnect(self) -> None:
         """Log agent disconnection."""
         self._append_transcript_event("Agent disconnected")
         metadata = self._load_metadata()
         if metadata["rejoins"] and metadata["rejoins"][-1]["left_at"] is None:
-            metadata["rejoins"][-1]["left_at"] = datetime.now(timezone.utc).isoformat()
+            metadata["rejoins"][-1]["left_at"] = self._clock().isoformat()
             self.metadata_path.write_text(json.dumps(metadata, indent=2))
 
     def log_session_end(self) -> None:
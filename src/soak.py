@@ -0,0 +1,319 @@
+"""Long-session soak test — drives simulated show turns and watches memory.
+
+Runs hours of simulated show time through the real SessionRecorder,
+avatar push loop, and the STT/TTS wrapper apps (in-process, with the
+models swapped for cheap synthetic stand-ins). RSS and tracemalloc are
+sampled as it goes; a growth slope above the threshold fails the run.
+
+Usage:
+    python -m src.soak --hours 3 --max-slope-mb 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import io
+import logging
+import sys
+import tempfile
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import numpy as np
+import scipy.io.wavfile
+from supertonic import Style
+
+from src import memstats
+from src.avatar.static import push_frames
+from src.session_recorder import SessionRecorder
+from src.wrappers import supertonic_api, whisper_api
+
+logger = logging.getLogger("clawcast.soak")
+
+HOST_LINES = [
+    "So tell me how you got into privacy tech.",
+    "What do you think about running models locally?",
+    "Is Bitcoin still relevant for the average person?",
+    "Where do you see this going in five years?",
+]
+
+AGENT_SENTENCES = [
+    "That's a great question.",
+    "Running models locally keeps your data on your own hardware.",
+    "It also means the latency is entirely in your hands.",
+    "I'd argue the tooling has finally caught up with the idea.",
+]
+
+
+class _SimClock:
+    """Simulated wall clock for the session recorder."""
+
+    def __init__(self) -> None:
+        self.now = datetime.now(timezone.utc)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += timedelta(seconds=seconds)
+
+
+class _FakeTextProcessor:
+    def validate_text(self, text: str) -> tuple[bool, list[str]]:
+        return True, []
+
+
+class _FakeModel:
+    """Batched pass, shaped like Supertonic's (batch, samples) output."""
+
+    text_processor = _FakeTextProcessor()
+
+    def __init__(self, seconds_per_char: float) -> None:
+        self.seconds_per_char = seconds_per_char
+
+    def __call__(self, texts, style, total_steps, speed, lang):
+        duration = np.array([max(len(t) * self.seconds_per_char / speed, 0.1) for t in texts])
+        t = np.arange(int(duration.max() * supertonic_api.SAMPLE_RATE)) / supertonic_api.SAMPLE_RATE
+        wav = (0.2 * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32)
+        return np.tile(wav, (len(texts), 1)), duration
+
+
+class _FakeTTS:
+    """Stands in for supertonic.TTS — emits a sine tone sized to the text."""
+
+    is_multilingual = False
+
+    def __init__(self, seconds_per_char: float) -> None:
+        self.model = _FakeModel(seconds_per_char)
+
+    def get_voice_style(self, voice_name: str) -> Style:
+        return Style(np.zeros((1, 1), dtype=np.float32), np.zeros((1, 1), dtype=np.float32))
+
+    def synthesize(self, text, voice_style=None, speed=1.0, total_steps=5, lang="en"):
+        wav, duration = self.model([text], voice_style, total_steps, speed, lang)
+        return wav, duration
+
+
+@dataclass
+class _Segment:
+    text: str
+    end: float = 0.0
+
+
+class _FakeWhisper:
+    """Stands in for faster_whisper.WhisperModel — echoes a canned line."""
+
+    def __init__(self) -> None:
+        self._n = 0
+
+    def transcribe(self, audio, language="en", beam_size=5):
+        self._n += 1
+        return [_Segment(HOST_LINES[self._n % len(HOST_LINES)])], None
+
+
+class _CountingSource:
+    """Stands in for rtc.VideoSource — counts captured frames."""
+
+    def __init__(self) -> None:
+        self.frames = 0
+
+    def capture_frame(self, frame) -> None:
+        self.frames += 1
+
+
+@dataclass
+class Sample:
+    sim_hours: float
+    rss_mb: float
+    traced_mb: float
+
+
+@dataclass
+class SoakResult:
+    samples: list[Sample] = field(default_factory=list)
+    turns: int = 0
+    jobs: int = 0
+    frames: int = 0
+    rss_slope: float = 0.0
+    traced_slope: float = 0.0
+    top_growth: list[str] = field(default_factory=list)
+
+
+def _host_wav(seconds: float) -> bytes:
+    """A short 48kHz WAV clip standing in for host speech."""
+    rate = 48000
+    t = np.arange(int(seconds * rate)) / rate
+    audio = (0.1 * np.sin(2 * np.pi * 180.0 * t) * 32767).astype(np.int16)
+    buf = io.BytesIO()
+    scipy.io.wavfile.write(buf, rate, audio)
+    return buf.getvalue()
+
+
+async def _run_turn(
+    stt: httpx.AsyncClient,
+    tts: httpx.AsyncClient,
+    recorder: SessionRecorder,
+    host_audio: bytes,
+    sentences: int,
+    turn: int,
+) -> None:
+    """One host utterance and one multi-sentence agent reply, as the agent drives it."""
+    resp = await stt.post(
+        "/v1/audio/transcriptions",
+        files={"file": ("host.wav", host_audio, "audio/wav")},
+        data={"model": "whisper-1", "language": "en"},
+    )
+    resp.raise_for_status()
+    recorder.log_host_speech(resp.json()["text"])
+
+    # Sentences are requested concurrently and tagged, as PipelinedTTS does
+    reply = [AGENT_SENTENCES[(turn + i) % len(AGENT_SENTENCES)] for i in range(sentences)]
+    reply_id = f"soak-{turn}"
+    responses = await asyncio.gather(*(
+        tts.post(
+            "/v1/audio/speech",
+            json={"input": s, "voice": "M1"},
+            headers={"X-Reply-Id": reply_id, "X-Reply-Seq": str(i)},
+        )
+        for i, s in enumerate(reply)
+    ))
+    for resp in responses:
+        resp.raise_for_status()
+
+    # The agent pops the whole reply by id
+    resp = await tts.post("/v1/audio/pop", params={"reply_id": reply_id})
+    audio_data = resp.content if resp.status_code == 200 else None
+    recorder.log_agent_response(" ".join(reply), audio_data=audio_data)
+
+
+def _sample(clock: _SimClock, start: datetime) -> Sample:
+    gc.collect()
+    stats = memstats.snapshot()
+    return Sample(
+        sim_hours=(clock.now - start).total_seconds() / 3600,
+        rss_mb=stats["rss_bytes"] / 1e6,
+        traced_mb=stats.get("traced_current_bytes", 0) / 1e6,
+    )
+
+
+async def run_soak(
+    hours: float = 3.0,
+    turn_seconds: float = 20.0,
+    sentences: int = 3,
+    seconds_per_char: float = 0.02,
+    turns_per_job: int = 100,
+    samples: int = 60,
+    warmup: float = 0.1,
+    output_dir: str | None = None,
+) -> SoakResult:
+    """Drive simulated turns for `hours` of show time and return memory samples."""
+    supertonic_api.tts = _FakeTTS(seconds_per_char)
+    whisper_api.model = _FakeWhisper()
+    await supertonic_api.start_batcher()
+
+    total_turns = max(int(hours * 3600 / turn_seconds), 1)
+    sample_every = max(total_turns // samples, 1)
+    warmup_turns = int(total_turns * warmup)
+    host_audio = _host_wav(2.0)
+    clock = _SimClock()
+    start = clock.now
+    result = SoakResult()
+    baseline: tracemalloc.Snapshot | None = None
+
+    tracemalloc.start()
+    tmp = tempfile.TemporaryDirectory() if output_dir is None else None
+    try:
+        async with (
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=whisper_api.app), base_url="http://stt") as stt,
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=supertonic_api.app), base_url="http://tts") as tts,
+        ):
+            turn = 0
+            while turn < total_turns:
+                # One "job": fresh recorder (rejoin path after the first) and avatar loop
+                recorder = SessionRecorder("soak", output_dir or tmp.name, clock=clock)
+                source = _CountingSource()
+                avatar_task = asyncio.create_task(push_frames(source, b"", interval=0.001))
+                result.jobs += 1
+
+                for _ in range(min(turns_per_job, total_turns - turn)):
+                    await _run_turn(stt, tts, recorder, host_audio, sentences, turn)
+                    clock.advance(turn_seconds)
+                    turn += 1
+                    if turn == warmup_turns:
+                        gc.collect()
+                        baseline = tracemalloc.take_snapshot()
+                    if turn % sample_every == 0:
+                        result.samples.append(_sample(clock, start))
+                        logger.info(
+                            "%6.2fh  turn %5d  rss %8.1f MB  traced %7.1f MB",
+                            result.samples[-1].sim_hours, turn,
+                            result.samples[-1].rss_mb, result.samples[-1].traced_mb,
+                        )
+
+                recorder.log_disconnect()
+                avatar_task.cancel()
+                try:
+                    await avatar_task
+                except asyncio.CancelledError:
+                    pass
+                result.frames += source.frames
+
+            result.turns = turn
+    finally:
+        if baseline is not None:
+            gc.collect()
+            diff = tracemalloc.take_snapshot().compare_to(baseline, "lineno")
+            result.top_growth = [str(stat) for stat in diff[:10]]
+        tracemalloc.stop()
+        if tmp is not None:
+            tmp.cleanup()
+
+    steady = [s for s in result.samples if s.sim_hours >= hours * warmup]
+    xs = [s.sim_hours for s in steady]
+    result.rss_slope = memstats.growth_slope(xs, [s.rss_mb for s in steady])
+    result.traced_slope = memstats.growth_slope(xs, [s.traced_mb for s in steady])
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Clawcast long-session soak test")
+    parser.add_argument("--hours", type=float, default=3.0, help="Simulated show length")
+    parser.add_argument("--turn-seconds", type=float, default=20.0, help="Simulated seconds per turn")
+    parser.add_argument("--sentences", type=int, default=3, help="TTS requests per agent reply")
+    parser.add_argument("--turns-per-job", type=int, default=100, help="Turns before a simulated rejoin")
+    parser.add_argument("--samples", type=int, default=60, help="Number of memory samples to take")
+    parser.add_argument("--max-slope-mb", type=float, default=16.0,
+                        help="Fail if RSS or traced memory grows faster than this (MB per simulated hour)")
+    parser.add_argument("--output-dir", default=None, help="Keep session files here instead of a temp dir")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    result = asyncio.run(run_soak(
+        hours=args.hours,
+        turn_seconds=args.turn_seconds,
+        sentences=args.sentences,
+        turns_per_job=args.turns_per_job,
+        samples=args.samples,
+        output_dir=args.output_dir,
+    ))
+
+    print(f"\n{result.turns} turns, {result.jobs} jobs, {result.frames} avatar frames")
+    print(f"RSS slope:    {result.rss_slope:+.2f} MB/h")
+    print(f"Traced slope: {result.traced_slope:+.2f} MB/h")
+    if result.top_growth:
+        print("\nTop allocation growth since warmup:")
+        for line in result.top_growth:
+            print(f"  {line}")
+
+    failed = max(result.rss_slope, result.traced_slope) > args.max_slope_mb
+    print(f"\n{'FAIL' if failed else 'PASS'} (threshold {args.max_slope_mb:.1f} MB/h)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Client-disconnect cancellation shared by the STT/TTS wrappers.
+
+When the host interrupts, LiveKit drops the agent's pending requests.
+The wrappers poll for the disconnect while work is queued or running,
+skip or abort what they can, and count the CPU time that saved.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass, field, fields
+
+from fastapi import Request
+
+DISCONNECT_POLL = 0.05  # Seconds between disconnect checks
+
+
+@dataclass
+class CancelStats:
+    """Cancellation counters, exposed on each wrapper's GET /metrics."""
+
+    requests_cancelled: int = 0
+    jobs_skipped: int = 0  # Dropped before any work started
+    jobs_aborted: int = 0  # Stopped part-way through
+    jobs_discarded: int = 0  # Finished after the client left; result thrown away
+    cpu_seconds_saved: float = 0.0  # Estimated from the running cost average
+    cpu_seconds_wasted: float = 0.0  # Measured, on discarded work
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **deltas: float) -> None:
+        """Increment counters. Safe to call from worker threads."""
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {f.name: getattr(self, f.name) for f in fields(self) if not f.name.startswith("_")}
+
+
+class CostEstimator:
+    """Running average of CPU seconds per unit of work (characters, audio seconds)."""
+
+    def __init__(self, alpha: float = 0.2) -> None:
+        self.alpha = alpha
+        self.per_unit: float | None = None
+
+    def observe(self, cpu_seconds: float, units: float) -> None:
+        if units <= 0:
+            return
+        sample = cpu_seconds / units
+        if self.per_unit is None:
+            self.per_unit = sample
+        else:
+            self.per_unit += self.alpha * (sample - self.per_unit)
+
+    def estimate(self, units: float) -> float:
+        return 0.0 if self.per_unit is None else self.per_unit * units
+
+
+async def wait_or_disconnect(request: Request, fut: asyncio.Future) -> bool:
+    """Wait for `fut` while polling for client disconnect.
+
+    Returns True once `fut` is done. If the client goes away first,
+    cancels `fut` and returns False.
+    """
+    while True:
+        done, _ = await asyncio.wait({fut}, timeout=DISCONNECT_POLL)
+        if done:
+            return True
+        if await request.is_disconnected():
+            fut.cancel()
+            # A cancelled gather() stores CancelledError; mark it retrieved
+            fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+            return False
@@ -1,30 +1,52 @@
 """OpenAI-compatible Supertonic TTS API wrapper.
 
 Wraps Supertonic behind POST /v1/audio/speech.
+Requests with the same voice/speed/steps that arrive within a few ms of
+each other are coalesced into one batched model pass. The diffusion step
+count can be set per request (`steps` or `quality`) or chosen
+automatically to meet a time-to-audio target under the current load.
 Run: uvicorn src.wrappers.supertonic_api:app --port 8200
 """
 
 from __future__ import annotations
 
+import asyncio
+import base64
 import io
+import os
 import threading
-from collections import deque
+import time
+import tracemalloc
+from collections import Counter, deque
+from dataclasses import dataclass, field
 
 import numpy as np
 import scipy.io.wavfile
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse, Response
-from supertonic import TTS
+from supertonic import TTS, Style
+
+from src import memstats
+from src.wrappers.cancellation import CancelStats, CostEstimator, wait_or_disconnect
 
 app = FastAPI(title="Clawcast Supertonic TTS")
 
 tts: TTS | None = None
 
 # Cache recent audio for archival retrieval by the agent.
-# Each entry: {"text": str, "wav_bytes": bytes}
+# Each entry: {"text": str, "wav_bytes": bytes, "reply_id": str | None, "seq": int}
+# PipelinedTTS tags each sentence with X-Reply-Id / X-Reply-Seq so the
+# agent can pop a whole reply at once.
+# Bounded by entry count and total bytes — if the agent stops popping
+# (e.g. during a long show), the oldest clips are dropped.
+CACHE_MAX_BYTES = int(os.environ.get("CLAWCAST_TTS_CACHE_MAX_BYTES", 32 * 1024 * 1024))
 _audio_cache: deque[dict] = deque(maxlen=64)
+_cache_bytes = 0
 _cache_lock = threading.Lock()
 
+# Opt-in GET /debug/memory endpoint (also starts tracemalloc).
+MEMORY_STATS = os.environ.get("CLAWCAST_MEMORY_STATS", "").lower() in ("true", "1", "yes")
+
 # Map OpenAI-style voice names to Supertonic voice styles.
 # Users can pass either the Supertonic name directly (M1, F3, etc.)
 # or an OpenAI-style name which we map here.
@@ -40,67 +62,421 @@ VOICE_MAP = {
 SAMPLE_RATE = 44100
 
 
+def _steps_value(steps: object) -> int | str:
+    """Validate a step count: "auto", an int, or a string of digits.
+
+    Raises ValueError on anything else (floats and booleans included).
+    """
+    if steps == "auto":
+        return "auto"
+    if isinstance(steps, str) and steps.isascii() and steps.isdigit():
+        steps = int(steps)
+    if isinstance(steps, bool) or not isinstance(steps, int):
+        raise ValueError('steps must be a whole number or "auto"')
+    if not 1 <= steps <= 100:
+        raise ValueError("steps must be between 1 and 100")
+    return steps
+
+
+def _steps_env(name: str, default: str, allow_auto: bool = False) -> int | str:
+    """Parse a step-count environment variable, failing at startup if invalid."""
+    try:
+        steps = _steps_value(os.environ.get(name, default))
+        if steps == "auto" and not allow_auto:
+            raise ValueError("steps must be a whole number")
+    except ValueError as e:
+        raise ValueError(f"{name}: {e}") from None
+    return steps
+
+
+# Diffusion steps. CLAWCAST_TTS_STEPS is the default for requests that set
+# neither `steps` nor `quality`: a number, or "auto" to adapt per batch.
+# Parsed here so a bad value fails at startup rather than on every request.
+DEFAULT_STEPS = _steps_env("CLAWCAST_TTS_STEPS", "5", allow_auto=True)
+MIN_STEPS = _steps_env("CLAWCAST_TTS_MIN_STEPS", "2")
+MAX_STEPS = _steps_env("CLAWCAST_TTS_MAX_STEPS", "10")
+if MIN_STEPS > MAX_STEPS:
+    raise ValueError(f"CLAWCAST_TTS_MIN_STEPS ({MIN_STEPS}) is above CLAWCAST_TTS_MAX_STEPS ({MAX_STEPS})")
+AUTO_INITIAL_STEPS = min(max(5, MIN_STEPS), MAX_STEPS)  # Until the first pass has been timed
+TARGET_TIME_TO_AUDIO = float(os.environ.get("CLAWCAST_TTS_TARGET_MS", 600)) / 1000
+QUALITY_STEPS = {"low": 2, "medium": 5, "high": 8, "auto": "auto"}
+
+# Coalescing: wait this long after the first queued request for others to
+# join its batch. Texts longer than BATCH_MAX_CHARS are synthesized alone
+# (Supertonic chunks long text internally).
+BATCH_WINDOW = float(os.environ.get("CLAWCAST_TTS_BATCH_WINDOW_MS", 10)) / 1000
+BATCH_MAX = int(os.environ.get("CLAWCAST_TTS_BATCH_MAX", 8))
+BATCH_MAX_CHARS = 300
+
+
+@dataclass
+class _SpeechJob:
+    text: str
+    voice: str
+    speed: float
+    steps: int | str  # Step count, or "auto"
+    future: asyncio.Future
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+_speech_queue: asyncio.Queue[_SpeechJob] | None = None
+_batch_task: asyncio.Task | None = None
+_queued_chars = 0  # Characters waiting in _speech_queue
+
+# Jobs whose client disconnected are skipped before synthesis and never cached.
+cancel_stats = CancelStats()
+_cost = CostEstimator()  # CPU seconds per character-step
+
+# Adaptive steps: measured synthesis time and what was chosen
+_step_cost = CostEstimator()  # Wall seconds per character-step
+_time_to_audio = CostEstimator()  # Running average, seconds
+_steps_used: Counter[int] = Counter()
+
+
 @app.on_event("startup")
 async def load_model():
     global tts
+    if MEMORY_STATS:
+        tracemalloc.start()
     tts = TTS()
 
 
-@app.post("/v1/audio/speech")
-async def synthesize(request: Request):
-    body = await request.json()
-    text = body.get("input", "")
-    voice_param = body.get("voice", "M1")
-    speed = float(body.get("speed", 1.2))
-
-    # Resolve voice name
-    voice_name = VOICE_MAP.get(voice_param, voice_param)
-    style = tts.get_voice_style(voice_name)
+@app.on_event("startup")
+async def start_batcher():
+    global _speech_queue, _batch_task
+    _speech_queue = asyncio.Queue()
+    _batch_task = asyncio.create_task(_batch_worker())
 
-    wav, duration = tts.synthesize(
-        text, voice_style=style, speed=speed, total_steps=5, lang="en"
-    )
 
-    # wav is numpy array shape (1, num_samples) at 44100 Hz
-    # Convert to int16 WAV bytes
+def _to_int16(wav: np.ndarray) -> np.ndarray:
+    """Squeeze a model waveform and convert float samples to int16."""
     audio = wav.squeeze()
     if audio.dtype != np.int16:
         # Normalize float to int16 range
         audio = np.clip(audio, -1.0, 1.0)
         audio = (audio * 32767).astype(np.int16)
+    return audio
+
+
+def _synthesize_batch(texts: list[str], voice_name: str, speed: float, steps: int) -> list[np.ndarray]:
+    """Render texts sharing a voice/speed in one model pass. Runs in a worker thread."""
+    style = tts.get_voice_style(voice_name)
+    if len(texts) == 1 or any(len(t) > BATCH_MAX_CHARS for t in texts):
+        return [
+            _to_int16(tts.synthesize(t, voice_style=style, speed=speed, total_steps=steps, lang="en")[0])
+            for t in texts
+        ]
+
+    # One style vector per text; the model trims nothing, so cut each row
+    # to its predicted duration.
+    n = len(texts)
+    batch_style = Style(np.repeat(style.ttl, n, axis=0), np.repeat(style.dp, n, axis=0))
+    lang = "en" if tts.is_multilingual else None
+    wav, duration = tts.model(texts, batch_style, steps, speed, lang)
+    return [_to_int16(wav[i, :int(duration[i] * SAMPLE_RATE)]) for i in range(n)]
+
+
+def _auto_steps(batch: list[_SpeechJob], chars_behind: int) -> int:
+    """Highest step count that still meets the time-to-audio target.
+
+    Budgets for this batch and everything queued behind it at the same
+    step count, less the time the oldest job has already waited. Under
+    contention this drops toward MIN_STEPS; when idle it rises to MAX_STEPS.
+    """
+    if _step_cost.per_unit is None:
+        return AUTO_INITIAL_STEPS
+    waited = time.monotonic() - min(j.queued_at for j in batch)
+    chars = sum(len(j.text) for j in batch) + chars_behind
+    steps = int((TARGET_TIME_TO_AUDIO - waited) / (chars * _step_cost.per_unit))
+    return min(max(steps, MIN_STEPS), MAX_STEPS)
+
+
+async def _batch_worker() -> None:
+    """Drain the speech queue, grouping jobs by voice/speed/steps into batched passes."""
+    global _queued_chars
+    while True:
+        jobs = [await _speech_queue.get()]
+        await asyncio.sleep(BATCH_WINDOW)
+        while not _speech_queue.empty():
+            jobs.append(_speech_queue.get_nowait())
+        drained_chars = sum(len(j.text) for j in jobs)
+        _queued_chars -= drained_chars
+        pending_chars = drained_chars  # Drained here but not yet rendered
+
+        groups: dict[tuple[str, float, int | str], list[_SpeechJob]] = {}
+        for job in jobs:
+            groups.setdefault((job.voice, job.speed, job.steps), []).append(job)
+
+        for (voice, speed, steps), group in groups.items():
+            for i in range(0, len(group), BATCH_MAX):
+                # Re-check right before each pass: earlier passes take time
+                batch = []
+                for job in group[i:i + BATCH_MAX]:
+                    pending_chars -= len(job.text)
+                    if job.future.cancelled():
+                        job_steps = steps if steps != "auto" else MIN_STEPS
+                        cancel_stats.add(jobs_skipped=1, cpu_seconds_saved=_cost.estimate(len(job.text) * job_steps))
+                    else:
+                        batch.append(job)
+                if batch:
+                    if steps == "auto":
+                        steps_now = _auto_steps(batch, pending_chars + _queued_chars)
+                    else:
+                        steps_now = steps
+                    await _run_batch(batch, voice, speed, steps_now)
+
+
+async def _run_batch(batch: list[_SpeechJob], voice: str, speed: float, steps: int) -> None:
+    """Run one batched pass and resolve its jobs' futures."""
+    chars = sum(len(j.text) for j in batch)
+    start = time.process_time()
+    wall_start = time.monotonic()
+    try:
+        wavs = await asyncio.to_thread(_synthesize_batch, [j.text for j in batch], voice, speed, steps)
+    except Exception as e:
+        if len(batch) > 1:
+            # Retry one at a time so a bad text only fails its own request
+            for job in batch:
+                if not job.future.done():
+                    await _run_batch([job], voice, speed, steps)
+            return
+        for job in batch:
+            if not job.future.done():
+                job.future.set_exception(e)
+        return
+    cpu = time.process_time() - start
+    now = time.monotonic()
+    _cost.observe(cpu, chars * steps)
+    _step_cost.observe(now - wall_start, chars * steps)
+    _steps_used[steps] += len(batch)
+
+    for job, audio in zip(batch, wavs):
+        if job.future.done():  # Client left mid-pass
+            cancel_stats.add(jobs_discarded=1, cpu_seconds_wasted=cpu * len(job.text) / chars)
+        else:
+            _time_to_audio.observe(now - job.queued_at, 1)
+            job.future.set_result((audio, len(batch), steps))
+
+
+async def _submit(
+    request: Request, texts: list[str], voice: str, speed: float, steps: int | str
+) -> list[tuple[np.ndarray, int, int]] | None:
+    """Queue texts for synthesis and wait for (audio, batch size, steps) per text.
+
+    Returns None if the client disconnects first; its queued jobs are
+    cancelled so the batch worker skips them.
+    """
+    global _queued_chars
+    loop = asyncio.get_running_loop()
+    jobs = [_SpeechJob(text, voice, speed, steps, loop.create_future()) for text in texts]
+    for job in jobs:
+        _speech_queue.put_nowait(job)
+        _queued_chars += len(job.text)
+    results = asyncio.gather(*(job.future for job in jobs))
+    if not await wait_or_disconnect(request, results):
+        cancel_stats.add(requests_cancelled=1)
+        return None
+    return results.result()
 
+
+def _wav_bytes(audio: np.ndarray) -> bytes:
     buf = io.BytesIO()
     scipy.io.wavfile.write(buf, SAMPLE_RATE, audio)
-    wav_bytes = buf.getvalue()
+    return buf.getvalue()
 
-    # Cache for archival retrieval
+
+def _parse_speech_body(body: dict) -> tuple[str, float]:
+    """Resolve voice name and speed from an OpenAI-style speech request."""
+    voice_param = body.get("voice", "M1")
+    speed = float(body.get("speed", 1.2))
+    return VOICE_MAP.get(voice_param, voice_param), speed
+
+
+def _unsupported_chars(texts: list[str]) -> str | None:
+    """Error detail if any text has characters the model can't render, else None.
+
+    Checked before queuing so one bad text can't fail a coalesced batch.
+    """
+    for text in texts:
+        is_valid, unsupported = tts.model.text_processor.validate_text(text)
+        if not is_valid:
+            return f"input has {len(unsupported)} unsupported character(s): {''.join(sorted(unsupported))}"
+    return None
+
+
+def _parse_steps(body: dict) -> int | str:
+    """Resolve the step count from `steps` (number or "auto") or `quality`.
+
+    Raises ValueError on anything else.
+    """
+    if body.get("steps") is not None:
+        return _steps_value(body["steps"])
+    if body.get("quality") is not None:
+        quality = body["quality"]
+        if not isinstance(quality, str) or quality not in QUALITY_STEPS:
+            raise ValueError(f"quality must be one of {', '.join(QUALITY_STEPS)}")
+        return QUALITY_STEPS[quality]
+    return DEFAULT_STEPS
+
+
+def _reply_tag(request: Request) -> tuple[str | None, int]:
+    """Reply id and sentence index from PipelinedTTS's request headers."""
+    try:
+        seq = int(request.headers.get("x-reply-seq", 0))
+    except ValueError:
+        seq = 0
+    return request.headers.get("x-reply-id"), seq
+
+
+def _cache_append(text: str, wav_bytes: bytes, reply_id: str | None = None, seq: int = 0) -> None:
+    """Append audio to the archival cache, evicting oldest entries over budget."""
+    global _cache_bytes
     with _cache_lock:
-        _audio_cache.append({"text": text, "wav_bytes": wav_bytes})
+        if len(_audio_cache) == _audio_cache.maxlen:
+            _cache_bytes -= len(_audio_cache[0]["wav_bytes"])
+        _audio_cache.append({"text": text, "wav_bytes": wav_bytes, "reply_id": reply_id, "seq": seq})
+        _cache_bytes += len(wav_bytes)
+        while _cache_bytes > CACHE_MAX_BYTES and len(_audio_cache) > 1:
+            _cache_bytes -= len(_audio_cache.popleft()["wav_bytes"])
+
+
+@app.post("/v1/audio/speech")
+async def synthesize(request: Request):
+    body = await request.json()
+    text = body.get("input", "")
+    if not text.strip():
+        return JSONResponse(status_code=400, content={"detail": "input must not be empty"})
+    if detail := _unsupported_chars([text]):
+        return JSONResponse(status_code=400, content={"detail": detail})
+    voice_name, speed = _parse_speech_body(body)
+    try:
+        steps = _parse_steps(body)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"detail": str(e)})
+
+    results = await _submit(request, [text], voice_name, speed, steps)
+    if results is None:
+        return Response(status_code=499)  # Client closed request; nothing cached
+    [(audio, batch_size, steps_used)] = results
+    wav_bytes = _wav_bytes(audio)
+
+    # Cache for archival retrieval
+    _cache_append(text, wav_bytes, *_reply_tag(request))
 
     return Response(
         content=wav_bytes,
         media_type="audio/wav",
-        headers={"Content-Type": "audio/wav"},
+        headers={
+            "Content-Type": "audio/wav",
+            "X-Batch-Size": str(batch_size),
+            "X-Steps": str(steps_used),
+        },
     )
 
 
-@app.post("/v1/audio/pop")
-async def pop_audio():
-    """Pop the oldest cached audio entry. Used by the agent for archival."""
+@app.post("/v1/audio/speech/batch")
+async def synthesize_batch(request: Request):
+    """Synthesize a list of texts in one batched pass.
+
+    Body is a speech request with `input` as a list of strings. Returns
+    {"audio": [<base64 WAV>, ...], "steps": [...]} in input order.
+    """
+    body = await request.json()
+    texts = body.get("input", [])
+    if not isinstance(texts, list) or not texts or not all(isinstance(t, str) and t.strip() for t in texts):
+        return JSONResponse(status_code=400, content={"detail": "input must be a list of non-empty strings"})
+    if detail := _unsupported_chars(texts):
+        return JSONResponse(status_code=400, content={"detail": detail})
+    voice_name, speed = _parse_speech_body(body)
+    try:
+        steps = _parse_steps(body)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"detail": str(e)})
+
+    results = await _submit(request, texts, voice_name, speed, steps)
+    if results is None:
+        return Response(status_code=499)
+    reply_id, seq = _reply_tag(request)
+    encoded = []
+    for i, (text, (audio, _, _)) in enumerate(zip(texts, results)):
+        wav_bytes = _wav_bytes(audio)
+        _cache_append(text, wav_bytes, reply_id, seq + i)
+        encoded.append(base64.b64encode(wav_bytes).decode("ascii"))
+    return {"audio": encoded, "steps": [steps_used for _, _, steps_used in results]}
+
+
+def _take_reply(reply_id: str) -> list[dict]:
+    """Remove and return a reply's cached sentences, in sentence order."""
+    global _audio_cache, _cache_bytes
     with _cache_lock:
-        if _audio_cache:
+        taken = [e for e in _audio_cache if e["reply_id"] == reply_id]
+        if taken:
+            _audio_cache = deque((e for e in _audio_cache if e["reply_id"] != reply_id), maxlen=_audio_cache.maxlen)
+            _cache_bytes -= sum(len(e["wav_bytes"]) for e in taken)
+    return sorted(taken, key=lambda e: e["seq"])
+
+
+@app.post("/v1/audio/pop")
+async def pop_audio(reply_id: str | None = None, sentences: int | None = None):
+    """Pop cached audio for archival by the agent.
+
+    With `reply_id`, removes every sentence of that reply and returns them
+    joined into one WAV. `sentences` limits the WAV to that many leading
+    sentences (the played part of an interrupted reply); the rest are
+    dropped. Without `reply_id`, pops the oldest entry.
+    """
+    global _cache_bytes
+    if reply_id is not None:
+        entries = [e for e in _take_reply(reply_id) if sentences is None or e["seq"] < sentences]
+        if not entries:
+            return Response(status_code=204)
+        audio = np.concatenate([scipy.io.wavfile.read(io.BytesIO(e["wav_bytes"]))[1] for e in entries])
+        entry = {"text": " ".join(e["text"] for e in entries), "wav_bytes": _wav_bytes(audio)}
+    else:
+        with _cache_lock:
+            if not _audio_cache:
+                return Response(status_code=204)
             entry = _audio_cache.popleft()
-            return Response(
-                content=entry["wav_bytes"],
-                media_type="audio/wav",
-                headers={
-                    "Content-Type": "audio/wav",
-                    "X-Text": entry["text"][:200],
-                },
-            )
-    return JSONResponse(status_code=204, content=None)
+            _cache_bytes -= len(entry["wav_bytes"])
+    return Response(
+        content=entry["wav_bytes"],
+        media_type="audio/wav",
+        headers={
+            "Content-Type": "audio/wav",
+            "X-Text": entry["text"][:200],
+        },
+    )
 
 
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "cancellation": cancel_stats.as_dict(),
+        "steps": {
+            "default": DEFAULT_STEPS,
+            "target_time_to_audio_ms": TARGET_TIME_TO_AUDIO * 1000,
+            "avg_time_to_audio_ms": _time_to_audio.estimate(1) * 1000,
+            "seconds_per_char_step": _step_cost.per_unit,
+            "queued_chars": _queued_chars,
+            "used": dict(sorted(_steps_used.items())),
+        },
+    }
+
+
+@app.get("/debug/memory")
+async def memory():
+    """Process memory and audio cache stats. Enabled by CLAWCAST_MEMORY_STATS=1."""
+    if not MEMORY_STATS:
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    with _cache_lock:
+        cache = {"entries": len(_audio_cache), "bytes": _cache_bytes}
+    return {
+        **memstats.snapshot(),
+        "audio_cache": cache,
+        "top_allocations": memstats.top_allocations(),
+    }
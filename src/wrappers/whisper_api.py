@@ -1,53 +1,122 @@
 """OpenAI-compatible Whisper STT API wrapper.
 
 Wraps faster-whisper behind POST /v1/audio/transcriptions.
+Transcription runs off the event loop; if the client disconnects, queued
+work is skipped and in-progress decoding stops at the next segment.
 Run: uvicorn src.wrappers.whisper_api:app --port 8100
 """
 
 from __future__ import annotations
 
+import asyncio
 import io
 import os
+import threading
+import time
+import tracemalloc
 
 import librosa
 import numpy as np
-from fastapi import FastAPI, File, Form, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, Form, Request, UploadFile
+from fastapi.responses import JSONResponse, Response
 from faster_whisper import WhisperModel
 
+from src import memstats
+from src.wrappers.cancellation import CancelStats, CostEstimator, wait_or_disconnect
+
 MODEL_SIZE = os.environ.get("CLAWCAST_STT_MODEL", "small.en")
 
+# Opt-in GET /debug/memory endpoint (also starts tracemalloc).
+MEMORY_STATS = os.environ.get("CLAWCAST_MEMORY_STATS", "").lower() in ("true", "1", "yes")
+
 app = FastAPI(title="Clawcast Whisper STT")
 
 model: WhisperModel | None = None
+_model_lock = threading.Lock()  # One transcription at a time, as before
+
+cancel_stats = CancelStats()
+_cost = CostEstimator()  # CPU seconds per second of audio
 
 
 @app.on_event("startup")
 async def load_model():
     global model
+    if MEMORY_STATS:
+        tracemalloc.start()
     model = WhisperModel(MODEL_SIZE, device="cpu", compute_type="int8")
 
 
+def _transcribe(audio_bytes: bytes, language: str, cancelled: threading.Event) -> str | None:
+    """Decode and transcribe in a worker thread. Returns None if cancelled."""
+    buf = io.BytesIO(audio_bytes)
+
+    # Load audio and resample to 16kHz (Whisper's expected rate).
+    # LiveKit sends 48kHz — librosa handles the conversion.
+    audio, _ = librosa.load(buf, sr=16000, mono=True)
+    audio = audio.astype(np.float32)
+    duration = len(audio) / 16000
+
+    with _model_lock:
+        if cancelled.is_set():
+            cancel_stats.add(jobs_skipped=1, cpu_seconds_saved=_cost.estimate(duration))
+            return None
+
+        start = time.process_time()
+        # Segments are decoded lazily, so stopping iteration stops the work
+        segments, _ = model.transcribe(audio, language=language, beam_size=5)
+        texts = []
+        decoded_until = 0.0
+        for seg in segments:
+            texts.append(seg.text.strip())
+            decoded_until = seg.end
+            if cancelled.is_set():
+                break
+        cpu = time.process_time() - start
+
+    if not cancelled.is_set():
+        _cost.observe(cpu, duration)
+        return " ".join(texts)
+
+    remaining = max(duration - decoded_until, 0.0)
+    if remaining > 0:
+        cancel_stats.add(jobs_aborted=1, cpu_seconds_saved=_cost.estimate(remaining), cpu_seconds_wasted=cpu)
+    else:
+        cancel_stats.add(jobs_discarded=1, cpu_seconds_wasted=cpu)
+    return None
+
+
 @app.post("/v1/audio/transcriptions")
 async def transcribe(
+    request: Request,
     file: UploadFile = File(...),
     model_name: str = Form(default="whisper-1", alias="model"),
     language: str = Form(default="en"),
 ):
     audio_bytes = await file.read()
-    buf = io.BytesIO(audio_bytes)
-
-    # Load audio and resample to 16kHz (Whisper's expected rate).
-    # LiveKit sends 48kHz — librosa handles the conversion.
-    audio, _ = librosa.load(buf, sr=16000, mono=True)
-    audio = audio.astype(np.float32)
 
-    segments, _ = model.transcribe(audio, language=language, beam_size=5)
-    text = " ".join(seg.text.strip() for seg in segments)
+    cancelled = threading.Event()
+    task = asyncio.ensure_future(asyncio.to_thread(_transcribe, audio_bytes, language, cancelled))
+    if not await wait_or_disconnect(request, task):
+        cancelled.set()
+        cancel_stats.add(requests_cancelled=1)
+        return Response(status_code=499)  # Client closed request
 
-    return JSONResponse({"text": text})
+    return JSONResponse({"text": task.result()})
 
 
 @app.get("/health")
 async def health():
     return {"status": "ok", "model": MODEL_SIZE}
+
+
+@app.get("/metrics")
+async def metrics():
+    return {"cancellation": cancel_stats.as_dict()}
+
+
+@app.get("/debug/memory")
+async def memory():
+    """Process memory stats. Enabled by CLAWCAST_MEMORY_STATS=1."""
+    if not MEMORY_STATS:
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    return {**memstats.snapshot(), "top_allocations": memstats.top_allocations()}